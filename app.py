@@ -6,20 +6,35 @@ Beautiful native desktop GUI for website reading and analysis
 
 import sys
 import os
-import requests
-from bs4 import BeautifulSoup
+import re
+import time
+import sqlite3
+import hashlib
+import shutil
+from collections import OrderedDict
+import tempfile
+import httpx
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
 from typing import Optional
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QLabel, QLineEdit, QPushButton, QTextEdit, QComboBox,
     QCheckBox, QSlider, QFileDialog, QMessageBox, QListWidget,
-    QListWidgetItem, QScrollArea, QFrame
+    QListWidgetItem, QScrollArea, QFrame, QButtonGroup
+)
+from PySide6.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, Signal, QSize, QRect, QUrl,
+    QSaveFile, QIODevice
+)
+from PySide6.QtGui import (
+    QFont, QColor, QPixmap, QPalette, QIcon, QTextCursor,
+    QPainter, QLinearGradient, QPixmapCache
 )
-from PySide6.QtCore import Qt, QThread, Signal, QSize, QRect
-from PySide6.QtGui import QFont, QColor, QPixmap, QPalette, QIcon, QTextCursor
 
 try:
     from openai import OpenAI
@@ -27,6 +42,17 @@ except ImportError:
     print("OpenAI package required. Install: pip install openai")
     sys.exit(1)
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+except ImportError:
+    # The multimedia backend needs system audio libraries; fall back to the OS player
+    QMediaPlayer = None
+
 try:
     import PyPDF2
 except ImportError:
@@ -34,14 +60,578 @@ except ImportError:
     sys.exit(1)
 
 
-class WorkerThread(QThread):
-    """Worker thread for long-running operations"""
-    finished = Signal(str)
+# Shared HTTP client: keep-alive connections are reused across all fetches, and
+# HTTP/2 servers multiplex concurrent fetches from one host over a single connection
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    # httpx already offers "br" in Accept-Encoding when a Brotli decoder is installed
+    'Accept': 'text/html,application/xhtml+xml',
+}
+# Connect fast, but give slow servers time to stream the body
+_FETCH_TIMEOUT = httpx.Timeout(10, connect=3.05)
+_HTTP = httpx.Client(
+    headers=_HEADERS,
+    timeout=_FETCH_TIMEOUT,
+    follow_redirects=True,
+    transport=httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        # Failed connection attempts are retried; requests that reached the server are not
+        retries=2
+    )
+)
+
+# Upper bound on concurrently running background tasks
+_MAX_WORKERS = 4
+# Upper bound on OpenAI requests in flight across all tasks, so fan-outs don't hit 429s;
+# a streamed request holds its slot until the stream is read
+_MAX_API_CALLS = 4
+_API_SLOTS = threading.BoundedSemaphore(_MAX_API_CALLS)
+
+# Amount of page text sent to the model, in tokens
+_PROMPT_TOKENS = 3500
+# Streamed fetches stop after this many characters, enough to fill the token budget
+_PROMPT_CHARS = _PROMPT_TOKENS * 4
+_STREAM_TEXT_TAGS = ("title", "h1", "h2", "h3", "p", "li")
+# Elements whose content is never readable page text
+_NOISE_TAGS = ("script", "style", "noscript", "iframe")
+# Body text outside the noise elements, selected by libxml2 rather than Python
+_BODY_TEXT_XPATH = etree.XPath(
+    "//body//text()[not(%s)]" % " or ".join(f"ancestor::{tag}" for tag in _NOISE_TAGS)
+)
+
+# Streamed output reaches the view every few tokens or every 50 ms, whichever comes first
+_STREAM_FLUSH_TOKENS = 8
+_STREAM_FLUSH_SECONDS = 0.05
+
+# Long pages are summarized map-reduce style: chunk summaries in parallel, then one merge
+_MAP_CHUNK_TOKENS = 1500
+_MAP_MAX_CHUNKS = 16
+# Neighbouring chunks share this many tokens so no sentence is cut off from its context
+_MAP_CHUNK_OVERLAP = 100
+_MAP_SUMMARY_TOKENS = 400
+_SUMMARY_SOURCE_CHARS = _MAP_CHUNK_TOKENS * 4 * _MAP_MAX_CHUNKS
+
+# Fixed parts of every chat request, built once; only the user message varies
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Вы полезный помощник, который кратко и точно резюмирует содержимое документов на русском и английском языке."
+}
+_ANALYZE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Вы полезный помощник, который отвечает на вопросы о содержимом документов. Отвечайте на русском языке."
+}
+_CHAT_OPTIONS = {"temperature": 0.7}
+
+
+# model -> loaded tokenizer, and model -> monotonic time of its last failed load
+_ENCODINGS = {}
+_ENCODING_FAILURES = {}
+# A tokenizer that failed to load is tried again after this many seconds
+_ENCODING_RETRY_SECONDS = 60
+
+
+def _get_encoding(model):
+    """Load the model's tokenizer once per process, or None while it is unavailable"""
+    encoding = _ENCODINGS.get(model)
+    if encoding is not None or tiktoken is None:
+        return encoding
+    failed_at = _ENCODING_FAILURES.get(model)
+    if failed_at is not None and time.monotonic() - failed_at < _ENCODING_RETRY_SECONDS:
+        return None
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Unknown model names share the tokenizer of the current chat models
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # The BPE table is downloaded on first use and may be unreachable offline;
+        # only the failure time is kept, so a later call can load it once online
+        _ENCODING_FAILURES[model] = time.monotonic()
+        return None
+    _ENCODINGS[model] = encoding
+    return encoding
+
+
+def _truncate_tokens(text, max_tokens, model):
+    """Cut text to at most max_tokens of the model's tokens"""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # Without a tokenizer assume the denser Cyrillic ratio of ~2 chars per token
+        return text[:max_tokens * 2]
+    # Tokens average a few characters, so usually only the head needs encoding
+    head = text[:max_tokens * 8]
+    tokens = encoding.encode(head, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        if len(text) <= len(head):
+            return text
+        # Unusually short tokens left budget over: the cut has to come from the whole text
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+    tokens = tokens[:max_tokens]
+    # Byte-level tokens can split a character; a half one would decode to U+FFFD
+    # and re-encode past the budget, so back off to the last complete character
+    while tokens:
+        try:
+            return encoding.decode_bytes(tokens).decode("utf-8")
+        except UnicodeDecodeError:
+            tokens = tokens[:-1]
+    return ""
+
+
+def _chunk_text(text, max_tokens, model, overlap=0):
+    """Split text into pieces of at most max_tokens tokens, each repeating the last overlap of the previous
+    
+    Without a tokenizer the text is packed by whole sentences and overlap is ignored.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return _split_by_sentence(text, max_tokens * 2) if text.strip() else []
+    tokens = encoding.encode(text, disallowed_special=())
+    if not tokens:
+        return []
+    step = max_tokens - overlap
+    # Stop once the rest of the text is already inside the previous chunk's overlap
+    return [encoding.decode(tokens[i:i + max_tokens]) for i in range(0, max(len(tokens) - overlap, 1), step)]
+
+
+# Fonts are copied by value on setFont, so one instance per style is shared by all widgets
+_FONT_TITLE = QFont("Segoe UI", 14, QFont.Weight.Bold)
+_FONT_HEADER = QFont("Segoe UI", 13, QFont.Weight.Bold)
+_FONT_BUTTON = QFont("Segoe UI", 11, QFont.Weight.Bold)
+_FONT_LABEL = QFont("Segoe UI", 10, QFont.Weight.Bold)
+_FONT_TEXT = QFont("Segoe UI", 10)
+_FONT_VOICE = QFont("Segoe UI", 9, QFont.Weight.Bold)
+_FONT_SMALL = QFont("Segoe UI", 9)
+
+# TTS voices and the character names shown on their buttons
+_VOICES = {
+    "alloy": "Астолфо\n(Мягкий)",
+    "echo": "Какаши\n(Серьёзный)",
+    "fishi": "Нацуки\n(Энергичный)",
+    "onyx": "Итачи\n(Загадочный)",
+    "nova": "Микаса\n(Стойкая)",
+    "shimmer": "Рем\n(Нежная)"
+}
+_VOICE_IDS = tuple(_VOICES)
+
+
+# TTS input is synthesized in sentence-aligned pieces requested in parallel
+_TTS_CHUNK_CHARS = 500
+_TTS_MAX_CHUNKS = 12
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…])\s+")
+
+# Page text cleanup: runs of spaces start a new line, blank lines collapse
+_MULTISPACE_RE = re.compile(r" {2,}")
+_MULTINEWLINE_RE = re.compile(r"\s*[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]\s*")
+# Prompt text: any run of spaces/tabs inside a line becomes one space
+_INLINE_SPACE_RE = re.compile(r"[^\S\n\r\v\f\x1c-\x1e\x85\u2028\u2029]+")
+
+# The OpenAI client is rebuilt only once typing in the key field pauses
+_API_KEY_DEBOUNCE_MS = 400
+_MIN_API_KEY_LENGTH = 20
+
+# Recently read pages kept in memory, keyed by URL, and re-fetched after an hour
+_PAGE_CACHE_SIZE = 32
+_PAGE_CACHE_TTL = 3600
+
+# Rows loaded into the history list per scroll step
+_HISTORY_PAGE = 50
+# Oldest history entries are dropped beyond this many
+_HISTORY_LIMIT = 200
+
+# Tab order in the main window
+_TAB_SUMMARIZE, _TAB_ANALYZE, _TAB_EXTRACT, _TAB_TTS, _TAB_HISTORY, _TAB_PDF, _TAB_HELP = range(7)
+
+
+def _split_by_sentence(text, max_chars):
+    """Pack whole sentences into chunks of at most max_chars characters"""
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        # A single overlong sentence is cut hard at the limit
+        while len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _clean_text(text):
+    """Put each phrase of extracted page text on its own non-empty line"""
+    text = _MULTISPACE_RE.sub("\n", text)
+    return _MULTINEWLINE_RE.sub("\n", text).strip()
+
+
+def _compact_text(text):
+    """Squeeze whitespace out of prompt text so the token budget goes to words"""
+    text = _INLINE_SPACE_RE.sub(" ", text)
+    return _MULTINEWLINE_RE.sub("\n", text).strip()
+
+
+def _parse_page(html_content):
+    """Return (title, text) of a fetched page from a single parse"""
+    try:
+        # Lexbor parses in C without a Python object per node and sniffs the charset itself
+        tree = LexborHTMLParser(html_content, encoding=True)
+        title = tree.css_first("title")
+        title = title.text() if title is not None else "Неизвестный сайт"
+        # One C-level pass removes every noise subtree
+        tree.strip_tags(list(_NOISE_TAGS))
+        root = tree.body or tree.root
+        return title, _clean_text(root.text()) if root is not None else ""
+    except Exception:
+        return _parse_page_lxml(html_content)
+
+
+def _parse_page_lxml(html_content):
+    """Extract title and text with lxml when Lexbor rejects a page"""
+    root = etree.HTML(html_content)
+    if root is None:
+        return "Неизвестный сайт", ""
+    title = root.findtext(".//title") or "Неизвестный сайт"
+    # Text nodes come straight from libxml2; no tree of Python wrappers is built
+    return title, _clean_text("".join(_BODY_TEXT_XPATH(root)))
+
+
+# Application stylesheet with the palette already resolved
+_STYLESHEET = """
+QMainWindow {
+    background-color: #f5f7fa;
+}
+
+QWidget {
+    background-color: #f5f7fa;
+}
+
+QTabWidget::pane {
+    border: 1px solid #e0e0e0;
+    background-color: white;
+}
+
+QTabBar::tab {
+    background-color: #e8eef7;
+    color: #667eea;
+    padding: 10px 25px;
+    border: none;
+    font-weight: bold;
+    margin-right: 2px;
+    border-top-left-radius: 6px;
+    border-top-right-radius: 6px;
+}
+
+QTabBar::tab:selected {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    color: white;
+}
+
+QTabBar::tab:hover:!selected {
+    background-color: #d8dff5;
+}
+
+QPushButton {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 10px 24px;
+    font-weight: bold;
+    font-size: 11pt;
+    min-height: 35px;
+}
+
+QPushButton:hover {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #7a8aef, stop:1 #8456b1);
+}
+
+QPushButton:pressed {
+    padding: 11px 23px;
+}
+
+QPushButton:disabled {
+    background: #ccc;
+    color: #999;
+}
+
+QLineEdit {
+    border: 2px solid #667eea;
+    border-radius: 6px;
+    padding: 8px 12px;
+    background-color: white;
+    font-size: 10pt;
+    color: #2c3e50;
+}
+
+QLineEdit:focus {
+    border: 2px solid #764ba2;
+    background-color: #f8f9fa;
+}
+
+QTextEdit {
+    border: 2px solid #e0e0e0;
+    border-radius: 6px;
+    padding: 10px;
+    background-color: white;
+    font-size: 10pt;
+    font-family: 'Courier New';
+    color: #2c3e50;
+}
+
+QTextEdit:focus {
+    border: 2px solid #667eea;
+}
+
+QComboBox {
+    border: 2px solid #667eea;
+    border-radius: 6px;
+    padding: 8px 12px;
+    background-color: white;
+    font-size: 10pt;
+    color: #2c3e50;
+}
+
+QComboBox::drop-down {
+    border: none;
+    width: 30px;
+}
+
+QComboBox::down-arrow {
+    image: none;
+}
+
+QCheckBox {
+    color: #2c3e50;
+    spacing: 8px;
+    font-size: 10pt;
+}
+
+QCheckBox::indicator {
+    width: 18px;
+    height: 18px;
+    border: 2px solid #667eea;
+    border-radius: 4px;
+    background-color: white;
+}
+
+QCheckBox::indicator:checked {
+    background-color: #667eea;
+}
+
+QLabel {
+    color: #2c3e50;
+}
+
+QSlider::groove:horizontal {
+    border: 1px solid #e0e0e0;
+    height: 8px;
+    background: #f0f0f0;
+    border-radius: 4px;
+}
+
+QSlider::handle:horizontal {
+    background: #667eea;
+    border: none;
+    width: 20px;
+    margin: -6px 0;
+    border-radius: 10px;
+}
+
+QSlider::handle:horizontal:hover {
+    background: #764ba2;
+}
+
+QListWidget {
+    border: 1px solid #e0e0e0;
+    border-radius: 6px;
+    background-color: white;
+    outline: none;
+}
+
+QListWidget::item:selected {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    color: white;
+}
+
+QScrollBar:vertical {
+    border: none;
+    background: #f0f0f0;
+    width: 10px;
+    border-radius: 5px;
+}
+
+QScrollBar::handle:vertical {
+    background: #667eea;
+    border-radius: 5px;
+    min-height: 20px;
+}
+
+QScrollBar::handle:vertical:hover {
+    background: #764ba2;
+}
+"""
+
+# Gradients drawn on every paint; replaced by pre-rendered strips at startup
+_GRADIENTS = {
+    "qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #667eea, stop:1 #764ba2)": ("aireader_grad", "#667eea", "#764ba2"),
+    "qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #7a8aef, stop:1 #8456b1)": ("aireader_grad_hover", "#7a8aef", "#8456b1"),
+}
+_GRADIENT_HEIGHT = 48
+
+
+def _gradient_image(key, top, bottom):
+    """Rasterize a vertical gradient once and return the path of its PNG"""
+    path = os.path.join(tempfile.gettempdir(), f"{key}.png").replace(os.sep, "/")
+    if QPixmapCache.find(key) is None or not os.path.exists(path):
+        pixmap = QPixmap(1, _GRADIENT_HEIGHT)
+        gradient = QLinearGradient(0, 0, 0, _GRADIENT_HEIGHT)
+        gradient.setColorAt(0, QColor(top))
+        gradient.setColorAt(1, QColor(bottom))
+        painter = QPainter(pixmap)
+        painter.fillRect(pixmap.rect(), gradient)
+        painter.end()
+        pixmap.save(path, "PNG")
+        QPixmapCache.insert(key, pixmap)
+    return path
+
+
+def _with_gradient_images(style):
+    """Swap QSS gradient backgrounds for blits of pre-rendered strips"""
+    for gradient, (key, top, bottom) in _GRADIENTS.items():
+        if gradient not in style:
+            continue
+        # Widgets taller than the strip fall back to the gradient's bottom color
+        style = style.replace(
+            f"background: {gradient};",
+            f"background-color: {bottom};\n"
+            f"    background-image: url({_gradient_image(key, top, bottom)});\n"
+            f"    background-repeat: repeat-x;\n"
+            f"    background-position: top left;"
+        )
+    return style
+
+
+def _make_openai_client(api_key):
+    """Create an OpenAI client on a pooled HTTP/2 transport"""
+    # Enough keep-alive slots for every pool thread to hold a warm connection
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=_MAX_WORKERS * 5,
+            max_keepalive_connections=_MAX_WORKERS * 2
+        ),
+        http2=True,
+        timeout=30.0
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+class QueryCache:
+    """On-disk cache of LLM responses keyed by request parameters"""
+    
+    def __init__(self, path, ttl):
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+        )
+        # Expired answers are dropped on startup so the file does not grow forever
+        self._db.execute("DELETE FROM cache WHERE ts < ?", (int(time.time()) - ttl,))
+        self._db.commit()
+    
+    @staticmethod
+    def make_key(*parts):
+        """Build a compact cache key from request parameters"""
+        raw = "|".join("" if part is None else str(part) for part in parts)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response FROM cache WHERE key=? AND ts >= ?",
+                (key, int(time.time()) - self._ttl)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, key, response):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time()))
+            )
+            self._db.commit()
+
+
+# Model answers are reused for a day, then asked again
+_QUERY_CACHE_TTL = 24 * 3600
+
+
+class HistoryStore:
+    """Persistent analysis history backed by an SQLite FTS5 index"""
+    
+    def __init__(self, path):
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS history "
+            "USING fts5(kind UNINDEXED, url, title, query, result, ts UNINDEXED)"
+        )
+        self._db.commit()
+    
+    def add(self, kind, url, title, query, result):
+        """Store an entry and return its (rowid, kind, title, ts) row"""
+        ts = int(time.time())
+        cursor = self._db.execute(
+            "INSERT INTO history (kind, url, title, query, result, ts) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, url, title, query, result, ts)
+        )
+        self._db.execute(
+            "DELETE FROM history WHERE rowid NOT IN "
+            "(SELECT rowid FROM history ORDER BY rowid DESC LIMIT ?)",
+            (_HISTORY_LIMIT,)
+        )
+        self._db.commit()
+        return cursor.lastrowid, kind, title, ts
+    
+    def page(self, offset, limit):
+        """Return (rowid, kind, title, ts) rows, newest first"""
+        return self._db.execute(
+            "SELECT rowid, kind, title, ts FROM history ORDER BY rowid DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+    
+    def clear(self):
+        self._db.execute("DELETE FROM history")
+        self._db.commit()
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a worker running in the thread pool"""
+    finished = Signal(object)
     error = Signal(str)
     progress = Signal(str)
+    # Audio voiced alongside a summary: output path, or the error that stopped it
+    audio_ready = Signal(str)
+    audio_error = Signal(str)
+    done = Signal()
+
+
+class WorkerRunnable(QRunnable):
+    """Pooled task for long-running operations"""
     
-    def __init__(self, task_type, url, query=None, content=None, client=None, model="gpt-3.5-turbo", max_length=500):
+    def __init__(self, task_type, url, query=None, content=None, client=None, model="gpt-3.5-turbo", max_length=500,
+                 max_chars=_PROMPT_CHARS, voice=None, audio_path=None, map_reduce=True, cache=None):
         super().__init__()
+        self.signals = WorkerSignals()
         self.task_type = task_type
         self.url = url
         self.query = query
@@ -49,13 +639,33 @@ class WorkerThread(QThread):
         self.client = client
         self.model = model
         self.max_length = max_length
+        self.max_chars = max_chars
+        # When set, a summary is also voiced into audio_path while it streams
+        self.voice = voice
+        self.audio_path = audio_path
+        # Summaries cover long texts chunk by chunk, or else the head in a single prompt
+        self.map_reduce = map_reduce
+        # QueryCache shared by the AI tasks
+        self.cache = cache
+        self.cancelled = threading.Event()
+        # Token budget the input was cut to, or None when it was sent whole
+        self.trimmed_to = None
+    
+    def cancel(self):
+        """Ask the task to stop; checked between chunks of network work"""
+        self.cancelled.set()
     
     def run(self):
         try:
             if self.task_type == "fetch":
-                result = self._fetch_website()
+                # Parsed here too, so a large page never stalls the GUI thread
+                result = _parse_page(self._fetch_website())
+            elif self.task_type == "fetch_text":
+                result = self._fetch_text()
             elif self.task_type == "summarize":
                 result = self._summarize()
+            elif self.task_type == "batch_summarize":
+                result = self._batch_summarize()
             elif self.task_type == "analyze":
                 result = self._analyze()
             elif self.task_type == "tts":
@@ -63,70 +673,300 @@ class WorkerThread(QThread):
             elif self.task_type == "extract_pdf":
                 result = self._extract_pdf_text()
             
-            self.finished.emit(result)
+            if not self.cancelled.is_set():
+                self.signals.finished.emit(result)
         except Exception as e:
-            self.error.emit(str(e))
+            if not self.cancelled.is_set():
+                self.signals.error.emit(str(e))
+        finally:
+            self.signals.done.emit()
     
     def _text_to_speech(self):
         """Convert text to speech"""
-        tts_text = self.content[:3000]
-        response = self.client.audio.speech.create(
+        chunks = _split_by_sentence(self.content, _TTS_CHUNK_CHARS)[:_TTS_MAX_CHUNKS]
+        
+        # Pieces share the client's connection pool; MP3 frames concatenate losslessly.
+        # self.url is the app's reusable output file; each run overwrites it, and
+        # pieces are written in order as soon as they finish instead of all at the end
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor, open(self.url, "wb") as f:
+            # self.model contains voice name for TTS
+            for part in executor.map(lambda chunk: self._synthesize(chunk, self.model), chunks):
+                f.write(part)
+        return self.url
+    
+    def _synthesize(self, chunk, voice):
+        """Voice one piece of text and return its MP3 bytes"""
+        if self.cancelled.is_set():
+            return b""
+        # Read the body as it arrives so a cancel stops mid-download
+        with _API_SLOTS, self.client.audio.speech.with_streaming_response.create(
             model="tts-1",
-            voice=self.model,  # self.model contains voice name for TTS
-            input=tts_text
-        )
-        
-        # Save audio file
-        audio_filename = f"audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-        audio_path = os.path.join(os.getcwd(), audio_filename)
-        response.stream_to_file(audio_path)
-        return audio_path
+            voice=voice,
+            input=chunk,
+            response_format="mp3"
+        ) as response:
+            parts = []
+            for data in response.iter_bytes():
+                if self.cancelled.is_set():
+                    return b""
+                parts.append(data)
+            return b"".join(parts)
     
     def _fetch_website(self):
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(self.url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        with _HTTP.stream("GET", self.url) as response:
+            response.raise_for_status()
+            # Raw bytes go to the parser as they are; no str decode
+            return response.read()
+    
+    def _fetch_text(self, url=None):
+        """Stream the page and collect readable text until the prompt is full"""
+        title = ""
+        parts = []
+        collected = 0
+        
+        with _HTTP.stream("GET", url or self.url) as response:
+            response.raise_for_status()
+            # Only trust an explicit charset; otherwise let libxml2 read <meta charset>
+            try:
+                parser = etree.HTMLPullParser(events=("end",), encoding=response.charset_encoding)
+            except LookupError:
+                # A label the decoder doesn't know (e.g. "utf8mb4") is treated as undeclared
+                parser = etree.HTMLPullParser(events=("end",), encoding=None)
+            
+            def consume(events):
+                nonlocal title, collected
+                for _, element in events:
+                    if element.tag in _NOISE_TAGS:
+                        element.clear(keep_tail=True)
+                    elif element.tag in _STREAM_TEXT_TAGS:
+                        # Text elements end before the noise element around them does
+                        if next(element.iterancestors(*_NOISE_TAGS), None) is not None:
+                            element.clear(keep_tail=True)
+                            continue
+                        text = " ".join("".join(element.itertext()).split())
+                        if element.tag == "title":
+                            title = title or text
+                        elif text:
+                            parts.append(text)
+                            collected += len(text) + 1
+                        # Drop collected subtrees so memory stays bounded by the chunk size
+                        element.clear(keep_tail=True)
+            
+            for chunk in response.iter_bytes(chunk_size=64 * 1024):
+                parser.feed(chunk)
+                consume(parser.read_events())
+                if collected >= self.max_chars or self.cancelled.is_set():
+                    break
+            else:
+                try:
+                    parser.close()
+                except etree.XMLSyntaxError:
+                    # An empty or blank body has no document to finish; it is an empty page
+                    pass
+                consume(parser.read_events())
+        
+        return title or "Неизвестный сайт", "\n".join(parts)
     
     def _summarize(self):
-        content = self.content[:8000]
+        if self.voice is None:
+            return self._summary_text()
+        
+        # Finished sentences are voiced while the rest of the summary still streams,
+        # so the audio is ready soon after the text instead of a whole TTS run later
+        pending = []
+        pieces = []
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            def speak(delta, final=False):
+                pending.append(delta)
+                text = "".join(pending)
+                if not final and len(text) < _TTS_CHUNK_CHARS:
+                    return
+                ready = _split_by_sentence(text, _TTS_CHUNK_CHARS)
+                # Until the stream ends the last piece may stop mid-sentence, so it waits
+                pending[:] = [] if final else [ready.pop()]
+                for piece in ready[:_TTS_MAX_CHUNKS - len(pieces)]:
+                    pieces.append(executor.submit(self._synthesize, piece, self.voice))
+            
+            result = self._summary_text(speak)
+            speak("", final=True)
+            if not pieces or self.cancelled.is_set():
+                return result
+            try:
+                with open(self.audio_path, "wb") as f:
+                    for piece in pieces:
+                        f.write(piece.result())
+            except Exception as e:
+                # The summary still stands when voicing it fails
+                if not self.cancelled.is_set():
+                    self.signals.audio_error.emit(str(e))
+            else:
+                if not self.cancelled.is_set():
+                    self.signals.audio_ready.emit(self.audio_path)
+        return result
+    
+    def _summary_text(self, on_delta=None):
+        """Summarize self.content, passing each streamed piece to on_delta as well"""
+        source = _compact_text(self.content)
+        if self.map_reduce:
+            chunks = _chunk_text(source, _MAP_CHUNK_TOKENS, self.model, _MAP_CHUNK_OVERLAP)
+            if len(chunks) > _MAP_MAX_CHUNKS:
+                chunks = chunks[:_MAP_MAX_CHUNKS]
+                self.trimmed_to = (_MAP_CHUNK_TOKENS - _MAP_CHUNK_OVERLAP) * _MAP_MAX_CHUNKS + _MAP_CHUNK_OVERLAP
+        else:
+            content = _truncate_tokens(source, _PROMPT_TOKENS, self.model)
+            if len(content) < len(source):
+                self.trimmed_to = _PROMPT_TOKENS
+            chunks = [content] if content.strip() else []
+        cache_key = QueryCache.make_key("summarize", self.model, self.max_length, None, *chunks)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # Delivered like a one-chunk stream so the view is filled the same way
+            self.signals.progress.emit(cached)
+            if on_delta is not None:
+                on_delta(cached)
+            return cached
+        
+        if len(chunks) > 1:
+            # Map: summarize every chunk at once over the shared connection pool
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+                partials = list(executor.map(self._summarize_chunk, chunks))
+            prompt = (
+                f"Объедините эти частичные резюме одного документа в одно резюме, "
+                f"используя примерно {self.max_length} символов:\n\n" + "\n\n".join(partials)
+            )
+        else:
+            content = chunks[0] if chunks else ""
+            prompt = f"Пожалуйста, резюмируйте следующее содержимое, используя примерно {self.max_length} символов:\n\n{content}"
+        
         # Calculate max_tokens based on desired length (approx 3 chars per token)
         max_tokens = min(2000, self.max_length // 3 + 100)
-        response = self.client.chat.completions.create(
+        with _API_SLOTS:
+            response = self._summary_request(prompt, max_tokens, stream=True)
+            result = self._collect_stream(response, on_delta)
+        if not self.cancelled.is_set():
+            self.cache.put(cache_key, result)
+        return result
+    
+    def _batch_summarize(self):
+        """Fetch and summarize every URL in self.url concurrently"""
+        max_tokens = min(2000, self.max_length // 3 + 100)
+        
+        def summarize_page(url):
+            if self.cancelled.is_set():
+                return url, None, ""
+            try:
+                title, text = self._fetch_text(url)
+            except Exception as e:
+                # One unreachable page should not sink the whole batch
+                return url, None, f"Ошибка загрузки: {e}"
+            content = _truncate_tokens(_compact_text(text), _PROMPT_TOKENS, self.model)
+            cache_key = QueryCache.make_key("batch_summarize", self.model, self.max_length, None, content)
+            summary = self.cache.get(cache_key)
+            if summary is None:
+                with _API_SLOTS:
+                    response = self._summary_request(
+                        f"Пожалуйста, резюмируйте следующее содержимое, используя примерно {self.max_length} символов:\n\n{content}",
+                        max_tokens
+                    )
+                summary = response.choices[0].message.content or ""
+                self.cache.put(cache_key, summary)
+            return url, title, summary
+        
+        # Page downloads and model calls overlap across URLs; results are shown in input order
+        results = []
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            for url, title, summary in executor.map(summarize_page, self.url):
+                if self.cancelled.is_set():
+                    break
+                if title is not None:
+                    results.append((url, title, summary))
+                self.signals.progress.emit(f"{title or url}\n{url}\n\n{summary}\n\n")
+        return results
+    
+    def _summarize_chunk(self, chunk):
+        """Map step: a short standalone summary of one part of the document"""
+        with _API_SLOTS:
+            response = self._summary_request(
+                f"Кратко резюмируйте эту часть документа, сохранив ключевые факты:\n\n{chunk}",
+                _MAP_SUMMARY_TOKENS
+            )
+        return response.choices[0].message.content or ""
+    
+    def _summary_request(self, prompt, max_tokens, stream=False):
+        return self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Вы полезный помощник, который кратко и точно резюмирует содержимое документов на русском и английском языке."
-                },
-                {
-                    "role": "user",
-                    "content": f"Пожалуйста, резюмируйте следующее содержимое, используя примерно {self.max_length} символов:\n\n{content}"
-                }
-            ],
-            temperature=0.7,
-            max_tokens=max_tokens
+            messages=[_SUMMARY_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            stream=stream,
+            **_CHAT_OPTIONS
         )
-        return response.choices[0].message.content
     
     def _analyze(self):
-        content = self.content[:8000]
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Вы полезный помощник, который отвечает на вопросы о содержимом документов. Отвечайте на русском языке."
-                },
-                {
-                    "role": "user",
-                    "content": f"На основе следующего содержимого документа ответьте на этот вопрос: {self.query}\n\nСодержимое:\n{content}"
-                }
-            ],
-            temperature=0.7,
-            max_tokens=800
-        )
-        return response.choices[0].message.content
+        source = _compact_text(self.content)
+        content = _truncate_tokens(source, _PROMPT_TOKENS, self.model)
+        if len(content) < len(source):
+            self.trimmed_to = _PROMPT_TOKENS
+        # A tuple query is a batch of questions answered in one request
+        questions = self.query if isinstance(self.query, tuple) else (self.query,)
+        cache_key = QueryCache.make_key("analyze", self.model, None, "\n".join(questions), content)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # Delivered like a one-chunk stream so the view is filled the same way
+            self.signals.progress.emit(cached)
+            return cached
+        
+        if len(questions) == 1:
+            prompt = f"На основе следующего содержимого документа ответьте на этот вопрос: {questions[0]}"
+            max_tokens = 800
+        else:
+            numbered = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+            prompt = (
+                "На основе следующего содержимого документа ответьте на каждый вопрос по порядку, "
+                f"начиная каждый ответ с номера вопроса:\n{numbered}"
+            )
+            max_tokens = min(2000, 400 * len(questions))
+        
+        with _API_SLOTS:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[_ANALYZE_SYSTEM_MESSAGE, {"role": "user", "content": f"{prompt}\n\nСодержимое:\n{content}"}],
+                max_tokens=max_tokens,
+                stream=True,
+                **_CHAT_OPTIONS
+            )
+            result = self._collect_stream(response)
+        if not self.cancelled.is_set():
+            self.cache.put(cache_key, result)
+        return result
+    
+    def _collect_stream(self, response, on_delta=None):
+        """Forward streamed completion tokens as progress and return the full text"""
+        parts = []
+        # Tokens are handed to the GUI in small batches rather than one signal each
+        flushed = 0
+        last_flush = time.monotonic()
+        for chunk in response:
+            if self.cancelled.is_set():
+                response.close()
+                break
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if delta:
+                parts.append(delta)
+                now = time.monotonic()
+                if len(parts) - flushed >= _STREAM_FLUSH_TOKENS or now - last_flush >= _STREAM_FLUSH_SECONDS:
+                    self._emit_delta("".join(parts[flushed:]), on_delta)
+                    flushed = len(parts)
+                    last_flush = now
+        if flushed < len(parts) and not self.cancelled.is_set():
+            self._emit_delta("".join(parts[flushed:]), on_delta)
+        return "".join(parts)
+    
+    def _emit_delta(self, delta, on_delta):
+        self.signals.progress.emit(delta)
+        if on_delta is not None:
+            on_delta(delta)
     
     def _extract_pdf_text(self):
         """Extract text from PDF file"""
@@ -149,202 +989,36 @@ class AIWebsiteReaderApp(QMainWindow):
         self.current_text = ""
         self.current_title = ""
         self.current_url = ""
-        self.history = []
-        self.worker_thread = None
+        self.current_stats = (0, 0)
+        self.pdf_text = ""
+        # url -> (title, text, max_chars read or None for the whole page, monotonic fetch time)
+        self.page_cache = OrderedDict()
+        self.history = HistoryStore(os.path.expanduser("~/.aireader.db"))
+        self.query_cache = QueryCache(os.path.expanduser("~/.aireader_cache.sqlite"), _QUERY_CACHE_TTL)
+        self.thread_pool = QThreadPool.globalInstance()
+        self.thread_pool.setMaxThreadCount(_MAX_WORKERS)
+        self.active_workers = set()
+        self.running_tasks = {}
+        # Clients replaced by a new key, kept open until their in-flight tasks finish
+        self.retired_clients = []
         self.audio_file_path = None
+        self.player = None
+        # One scratch file for every TTS run, so old takes never pile up on disk
+        fd, self.audio_tmp_path = tempfile.mkstemp(prefix="aireader_tts_", suffix=".mp3")
+        os.close(fd)
         self.selected_voice = "alloy"
         
         self.setup_styles()
         self.setup_ui()
-        self.setup_connections()
+        
+        # The key may come from the environment, in which case textChanged never fires
+        if self.api_key:
+            self.on_api_key_changed()
     
     def setup_styles(self):
-        """Setup beautiful stylesheet"""
-        # Define colors
-        primary = "#667eea"
-        primary_dark = "#764ba2"
-        accent = "#667eea"
-        bg = "#f5f7fa"
-        text_dark = "#2c3e50"
-        text_light = "#666"
-        border_color = "#e0e0e0"
-        
-        style = f"""
-        QMainWindow {{
-            background-color: {bg};
-        }}
-        
-        QWidget {{
-            background-color: {bg};
-        }}
-        
-        QTabWidget::pane {{
-            border: 1px solid {border_color};
-            background-color: white;
-        }}
-        
-        QTabBar::tab {{
-            background-color: #e8eef7;
-            color: {primary};
-            padding: 10px 25px;
-            border: none;
-            font-weight: bold;
-            margin-right: 2px;
-            border-top-left-radius: 6px;
-            border-top-right-radius: 6px;
-        }}
-        
-        QTabBar::tab:selected {{
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {primary}, stop:1 {primary_dark});
-            color: white;
-        }}
-        
-        QTabBar::tab:hover:!selected {{
-            background-color: #d8dff5;
-        }}
-        
-        QPushButton {{
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {primary}, stop:1 {primary_dark});
-            color: white;
-            border: none;
-            border-radius: 6px;
-            padding: 10px 24px;
-            font-weight: bold;
-            font-size: 11pt;
-            min-height: 35px;
-        }}
-        
-        QPushButton:hover {{
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #7a8aef, stop:1 #8456b1);
-        }}
-        
-        QPushButton:pressed {{
-            padding: 11px 23px;
-        }}
-        
-        QPushButton:disabled {{
-            background-color: #ccc;
-            color: #999;
-        }}
-        
-        QLineEdit {{
-            border: 2px solid {primary};
-            border-radius: 6px;
-            padding: 8px 12px;
-            background-color: white;
-            font-size: 10pt;
-            color: {text_dark};
-        }}
-        
-        QLineEdit:focus {{
-            border: 2px solid {primary_dark};
-            background-color: #f8f9fa;
-        }}
-        
-        QTextEdit {{
-            border: 2px solid {border_color};
-            border-radius: 6px;
-            padding: 10px;
-            background-color: white;
-            font-size: 10pt;
-            font-family: 'Courier New';
-            color: {text_dark};
-        }}
-        
-        QTextEdit:focus {{
-            border: 2px solid {primary};
-        }}
-        
-        QComboBox {{
-            border: 2px solid {primary};
-            border-radius: 6px;
-            padding: 8px 12px;
-            background-color: white;
-            font-size: 10pt;
-            color: {text_dark};
-        }}
-        
-        QComboBox::drop-down {{
-            border: none;
-            width: 30px;
-        }}
-        
-        QComboBox::down-arrow {{
-            image: none;
-        }}
-        
-        QCheckBox {{
-            color: {text_dark};
-            spacing: 8px;
-            font-size: 10pt;
-        }}
-        
-        QCheckBox::indicator {{
-            width: 18px;
-            height: 18px;
-            border: 2px solid {primary};
-            border-radius: 4px;
-            background-color: white;
-        }}
-        
-        QCheckBox::indicator:checked {{
-            background-color: {primary};
-        }}
-        
-        QLabel {{
-            color: {text_dark};
-        }}
-        
-        QSlider::groove:horizontal {{
-            border: 1px solid {border_color};
-            height: 8px;
-            background: #f0f0f0;
-            border-radius: 4px;
-        }}
-        
-        QSlider::handle:horizontal {{
-            background: {primary};
-            border: none;
-            width: 20px;
-            margin: -6px 0;
-            border-radius: 10px;
-        }}
-        
-        QSlider::handle:horizontal:hover {{
-            background: {primary_dark};
-        }}
-        
-        QListWidget {{
-            border: 1px solid {border_color};
-            border-radius: 6px;
-            background-color: white;
-            outline: none;
-        }}
-        
-        QListWidget::item:selected {{
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {primary}, stop:1 {primary_dark});
-            color: white;
-        }}
-        
-        QScrollBar:vertical {{
-            border: none;
-            background: #f0f0f0;
-            width: 10px;
-            border-radius: 5px;
-        }}
-        
-        QScrollBar::handle:vertical {{
-            background: {primary};
-            border-radius: 5px;
-            min-height: 20px;
-        }}
-        
-        QScrollBar::handle:vertical:hover {{
-            background: {primary_dark};
-        }}
-        """
-        
-        self.setStyleSheet(style)
+        """Apply the application-wide stylesheet"""
+        # Set once on the QApplication so Qt parses it a single time for all widgets
+        QApplication.instance().setStyleSheet(_with_gradient_images(_STYLESHEET))
     
     def setup_ui(self):
         """Setup main UI"""
@@ -361,18 +1035,35 @@ class AIWebsiteReaderApp(QMainWindow):
         sidebar.setMaximumWidth(320)
         sidebar.setStyleSheet("border-right: 1px solid #e0e0e0;")
         
-        # Main content
-        tabs = QTabWidget()
-        tabs.addTab(self.create_summarize_tab(), " Содержание")
-        tabs.addTab(self.create_analyze_tab(), " Анализ")
-        tabs.addTab(self.create_extract_tab(), " Текст")
-        tabs.addTab(self.create_tts_tab(), " Озвучивание")
-        tabs.addTab(self.create_history_tab(), " История")
-        tabs.addTab(self.create_pdf_tab(), " PDF")
-        tabs.addTab(self.create_help_tab(), "ℹ Справка")
+        # Main content: tab pages are placeholders until first shown
+        self.tabs = QTabWidget()
+        self._tab_builders = [
+            self.create_summarize_tab,
+            self.create_analyze_tab,
+            self.create_extract_tab,
+            self.create_tts_tab,
+            self.create_history_tab,
+            self.create_pdf_tab,
+            self.create_help_tab
+        ]
+        tab_titles = [" Содержание", " Анализ", " Текст", " Озвучивание", " История", " PDF", "ℹ Справка"]
+        for tab_title in tab_titles:
+            placeholder = QWidget()
+            QVBoxLayout(placeholder).setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(placeholder, tab_title)
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tabs.currentIndex())
         
         main_layout.addWidget(sidebar)
-        main_layout.addWidget(tabs, 1)
+        main_layout.addWidget(self.tabs, 1)
+    
+    def ensure_tab(self, index):
+        """Build the contents of a lazily created tab"""
+        builder = self._tab_builders[index]
+        if builder is None:
+            return
+        self._tab_builders[index] = None
+        self.tabs.widget(index).layout().addWidget(builder())
     
     def create_sidebar(self):
         """Create settings sidebar"""
@@ -384,8 +1075,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Header
         header = QLabel("НАСТРОЙКИ")
-        header_font = QFont("Segoe UI", 13, QFont.Weight.Bold)
-        header.setFont(header_font)
+        header.setFont(_FONT_HEADER)
         header.setStyleSheet("color: #667eea; margin-bottom: 10px;")
         layout.addWidget(header)
         
@@ -397,13 +1087,17 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # API Key section
         api_label = QLabel(" OpenAI API Key:")
-        api_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        api_label.setFont(_FONT_LABEL)
         layout.addWidget(api_label)
         
         self.api_input = QLineEdit()
         self.api_input.setEchoMode(QLineEdit.EchoMode.Password)
         self.api_input.setText(self.api_key)
-        self.api_input.textChanged.connect(self.on_api_key_changed)
+        self.api_key_timer = QTimer(self)
+        self.api_key_timer.setSingleShot(True)
+        self.api_key_timer.setInterval(_API_KEY_DEBOUNCE_MS)
+        self.api_key_timer.timeout.connect(self.on_api_key_changed)
+        self.api_input.textChanged.connect(lambda _: self.api_key_timer.start())
         self.api_input.setMinimumHeight(35)
         layout.addWidget(self.api_input)
         
@@ -411,7 +1105,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Settings section
         settings_label = QLabel(" ПАРАМЕТРЫ:")
-        settings_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        settings_label.setFont(_FONT_LABEL)
         layout.addWidget(settings_label)
         
         self.js_checkbox = QCheckBox(" JavaScript рендеринг")
@@ -424,11 +1118,17 @@ class AIWebsiteReaderApp(QMainWindow):
         self.tts_checkbox.setMinimumHeight(25)
         layout.addWidget(self.tts_checkbox)
         
+        self.refresh_pages_btn = QPushButton("Обновить страницы")
+        self.refresh_pages_btn.setMinimumHeight(35)
+        self.refresh_pages_btn.setToolTip("Забыть загруженные страницы и скачать их заново")
+        self.refresh_pages_btn.clicked.connect(self.page_cache.clear)
+        layout.addWidget(self.refresh_pages_btn)
+        
         layout.addSpacing(15)
         
         # Model section
         model_label = QLabel(" Модель ИИ:")
-        model_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        model_label.setFont(_FONT_LABEL)
         layout.addWidget(model_label)
         
         self.model_combo = QComboBox()
@@ -440,7 +1140,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Length slider
         length_label = QLabel(" Длина резюме:")
-        length_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        length_label.setFont(_FONT_LABEL)
         layout.addWidget(length_label)
         
         self.length_slider = QSlider(Qt.Orientation.Horizontal)
@@ -468,7 +1168,7 @@ class AIWebsiteReaderApp(QMainWindow):
         # Info box
 
         info = QLabel("")
-        info.setFont(QFont("Segoe UI", 9))
+        info.setFont(_FONT_SMALL)
         info.setAlignment(Qt.AlignmentFlag.AlignCenter)
         info.setStyleSheet("background-color: #f0f0f0; padding: 12px; border-radius: 6px; color: #666;")
         info.setMinimumHeight(100)
@@ -491,32 +1191,38 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel(" Резюмирование сайта")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # URL input
         url_label = QLabel(" URL:")
-        url_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        url_label.setFont(_FONT_LABEL)
         layout.addWidget(url_label)
         
         self.url_input_summarize = QLineEdit()
-        self.url_input_summarize.setPlaceholderText("https://example.com")
+        self.url_input_summarize.setPlaceholderText("https://example.com (несколько адресов — через пробел)")
         self.url_input_summarize.setMinimumHeight(38)
         layout.addWidget(self.url_input_summarize)
         
+        self.map_reduce_checkbox = QCheckBox(" Длинные статьи (map-reduce)")
+        self.map_reduce_checkbox.setToolTip("Резюмировать всю статью по частям, а не только её начало")
+        self.map_reduce_checkbox.setChecked(True)
+        self.map_reduce_checkbox.setMinimumHeight(25)
+        layout.addWidget(self.map_reduce_checkbox)
+        
         # Button
         self.summarize_btn = QPushButton(" Анализировать")
         self.summarize_btn.setMinimumHeight(45)
-        self.summarize_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        self.summarize_btn.setFont(_FONT_BUTTON)
+        self.summarize_btn.clicked.connect(self.on_summarize_clicked)
         layout.addWidget(self.summarize_btn)
         
         layout.addSpacing(10)
         
         # Metrics
         self.summarize_metrics = QLabel("Результаты появятся здесь...")
-        self.summarize_metrics.setFont(QFont("Segoe UI", 9))
+        self.summarize_metrics.setFont(_FONT_SMALL)
         self.summarize_metrics.setStyleSheet("color: #666;")
         layout.addWidget(self.summarize_metrics)
         
@@ -528,7 +1234,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Status
         self.summarize_status = QLabel("✅ Готово")
-        self.summarize_status.setFont(QFont("Segoe UI", 9))
+        self.summarize_status.setFont(_FONT_SMALL)
         self.summarize_status.setStyleSheet("color: #28a745;")
         layout.addWidget(self.summarize_status)
         
@@ -543,14 +1249,13 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel("Анализ с вопросом")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # URL input
         url_label = QLabel("URL:")
-        url_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        url_label.setFont(_FONT_LABEL)
         layout.addWidget(url_label)
         
         self.url_input_analyze = QLineEdit()
@@ -560,7 +1265,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Question input
         question_label = QLabel(" Вопрос:")
-        question_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        question_label.setFont(_FONT_LABEL)
         layout.addWidget(question_label)
         
         self.question_input = QTextEdit()
@@ -568,10 +1273,16 @@ class AIWebsiteReaderApp(QMainWindow):
         self.question_input.setMinimumHeight(100)
         layout.addWidget(self.question_input)
         
+        self.batch_questions_checkbox = QCheckBox(" Несколько вопросов (по одному на строку)")
+        self.batch_questions_checkbox.setChecked(False)
+        self.batch_questions_checkbox.setMinimumHeight(25)
+        layout.addWidget(self.batch_questions_checkbox)
+        
         # Button
         self.analyze_btn = QPushButton(" Проанализировать")
         self.analyze_btn.setMinimumHeight(45)
-        self.analyze_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        self.analyze_btn.setFont(_FONT_BUTTON)
+        self.analyze_btn.clicked.connect(self.on_analyze_clicked)
         layout.addWidget(self.analyze_btn)
         
         layout.addSpacing(10)
@@ -584,7 +1295,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Status
         self.analyze_status = QLabel("✅ Готово")
-        self.analyze_status.setFont(QFont("Segoe UI", 9))
+        self.analyze_status.setFont(_FONT_SMALL)
         self.analyze_status.setStyleSheet("color: #28a745;")
         layout.addWidget(self.analyze_status)
         
@@ -599,14 +1310,13 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel(" Извлечение текста")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # URL input
         url_label = QLabel(" URL:")
-        url_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        url_label.setFont(_FONT_LABEL)
         layout.addWidget(url_label)
         
         self.url_input_extract = QLineEdit()
@@ -617,15 +1327,16 @@ class AIWebsiteReaderApp(QMainWindow):
         # Button
         self.extract_btn = QPushButton(" Извлечь текст")
         self.extract_btn.setMinimumHeight(45)
-        self.extract_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        self.extract_btn.setFont(_FONT_BUTTON)
+        self.extract_btn.clicked.connect(self.on_extract_clicked)
         layout.addWidget(self.extract_btn)
         
         # Metrics
         metrics_layout = QHBoxLayout()
         self.extract_chars = QLabel(" Символов: 0")
-        self.extract_chars.setFont(QFont("Segoe UI", 9))
+        self.extract_chars.setFont(_FONT_SMALL)
         self.extract_words = QLabel(" Слов: 0")
-        self.extract_words.setFont(QFont("Segoe UI", 9))
+        self.extract_words.setFont(_FONT_SMALL)
         metrics_layout.addWidget(self.extract_chars)
         metrics_layout.addStretch()
         metrics_layout.addWidget(self.extract_words)
@@ -640,11 +1351,12 @@ class AIWebsiteReaderApp(QMainWindow):
         # Download button
         self.download_btn = QPushButton("⬇ Скачать как TXT")
         self.download_btn.setMinimumHeight(40)
+        self.download_btn.clicked.connect(self.on_download_clicked)
         layout.addWidget(self.download_btn)
         
         # Status
         self.extract_status = QLabel("✅ Готово")
-        self.extract_status.setFont(QFont("Segoe UI", 9))
+        self.extract_status.setFont(_FONT_SMALL)
         self.extract_status.setStyleSheet("color: #28a745;")
         layout.addWidget(self.extract_status)
         
@@ -659,48 +1371,40 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel(" Озвучивание сайта")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # Info
         info = QLabel("Выберите голос аниме персонажа и озвучьте текст с сайта")
-        info.setFont(QFont("Segoe UI", 10))
+        info.setFont(_FONT_TEXT)
         info.setStyleSheet("color: #666;")
         layout.addWidget(info)
         
         # Voice selection
         voice_label = QLabel(" Выберите голос персонажа:")
-        voice_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        voice_label.setFont(_FONT_LABEL)
         layout.addWidget(voice_label)
         
         # Voice buttons layout
         voice_layout = QHBoxLayout()
         
-        self.voice_buttons = {}
-        voices = {
-            "alloy": "Астолфо\n(Мягкий)",
-            "echo": "Какаши\n(Серьёзный)",
-            "fishi": "Нацуки\n(Энергичный)",
-            "onyx": "Итачи\n(Загадочный)",
-            "nova": "Микаса\n(Стойкая)",
-            "shimmer": "Рем\n(Нежная)"
-        }
-        
+        # Exclusive group: one native idClicked connection serves every voice button
+        self.voice_group = QButtonGroup(self)
+        self.voice_group.setExclusive(True)
         self.selected_voice = "alloy"
         
-        for voice_id, char_name in voices.items():
+        for index, (voice_id, char_name) in enumerate(_VOICES.items()):
             btn = QPushButton(f" {char_name}")
             btn.setMinimumHeight(60)
             btn.setMinimumWidth(100)
-            btn.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+            btn.setFont(_FONT_VOICE)
             btn.setCheckable(True)
             if voice_id == "alloy":
                 btn.setChecked(True)
-            btn.clicked.connect(lambda checked, v=voice_id: self.select_voice(v))
-            self.voice_buttons[voice_id] = btn
+            self.voice_group.addButton(btn, index)
             voice_layout.addWidget(btn)
+        self.voice_group.idClicked.connect(self.select_voice)
         
         layout.addLayout(voice_layout)
         
@@ -708,7 +1412,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Text input
         text_label = QLabel(" Текст для озвучивания:")
-        text_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        text_label.setFont(_FONT_LABEL)
         layout.addWidget(text_label)
         
         self.tts_text_input = QTextEdit()
@@ -734,22 +1438,7 @@ class AIWebsiteReaderApp(QMainWindow):
         # TTS button
         self.tts_btn = QPushButton(" Озвучить текст")
         self.tts_btn.setMinimumHeight(45)
-        self.tts_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        self.tts_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #667eea, stop:1 #764ba2);
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 24px;
-                font-weight: bold;
-                font-size: 11pt;
-                min-height: 45px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #7a8aef, stop:1 #8456b1);
-            }
-        """)
+        self.tts_btn.setFont(_FONT_BUTTON)
         self.tts_btn.clicked.connect(self.on_tts_clicked)
         layout.addWidget(self.tts_btn)
         
@@ -757,14 +1446,16 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Audio player
         self.audio_label = QLabel(" Аудио плеер:")
-        self.audio_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.audio_label.setFont(_FONT_LABEL)
         layout.addWidget(self.audio_label)
         
-        self.audio_output = QTextEdit()
-        self.audio_output.setReadOnly(True)
+        self.audio_output = QLabel("Аудио появится здесь после генерации...")
+        self.audio_output.setTextFormat(Qt.TextFormat.PlainText)
+        self.audio_output.setWordWrap(True)
         self.audio_output.setMaximumHeight(80)
-        self.audio_output.setText("Аудио появится здесь после генерации...")
-        self.audio_output.setStyleSheet("color: #666;")
+        self.audio_output.setStyleSheet(
+            "color: #666; background-color: white; border: 2px solid #e0e0e0; border-radius: 6px; padding: 10px;"
+        )
         layout.addWidget(self.audio_output)
         
         # Play button
@@ -783,7 +1474,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Status
         self.tts_status = QLabel("✅ Готово")
-        self.tts_status.setFont(QFont("Segoe UI", 9))
+        self.tts_status.setFont(_FONT_SMALL)
         self.tts_status.setStyleSheet("color: #28a745;")
         layout.addWidget(self.tts_status)
         
@@ -800,21 +1491,24 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel("История анализов")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # History list
         self.history_list = QListWidget()
         self.history_list.setMinimumHeight(400)
+        self.history_list.verticalScrollBar().valueChanged.connect(self.on_history_scrolled)
         layout.addWidget(self.history_list)
         
         # Clear button
         self.clear_history_btn = QPushButton("Очистить историю")
         self.clear_history_btn.setMinimumHeight(40)
+        self.clear_history_btn.clicked.connect(self.on_clear_history_clicked)
         layout.addWidget(self.clear_history_btn)
         
+        self.load_more_history()
+        
         return widget
     
     def create_pdf_tab(self):
@@ -826,14 +1520,13 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel(" Анализ PDF файлов")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # File selection
         file_label = QLabel(" Выберите PDF файл:")
-        file_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        file_label.setFont(_FONT_LABEL)
         layout.addWidget(file_label)
         
         file_layout = QHBoxLayout()
@@ -844,6 +1537,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         self.pdf_browse_btn = QPushButton(" Обзор")
         self.pdf_browse_btn.setMinimumHeight(38)
+        self.pdf_browse_btn.clicked.connect(self.on_pdf_browse_clicked)
         file_layout.addWidget(self.pdf_browse_btn)
         layout.addLayout(file_layout)
         
@@ -851,18 +1545,20 @@ class AIWebsiteReaderApp(QMainWindow):
         buttons_layout = QHBoxLayout()
         self.pdf_extract_btn = QPushButton(" Извлечь текст")
         self.pdf_extract_btn.setMinimumHeight(45)
-        self.pdf_extract_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        self.pdf_extract_btn.setFont(_FONT_BUTTON)
+        self.pdf_extract_btn.clicked.connect(self.on_pdf_extract_clicked)
         buttons_layout.addWidget(self.pdf_extract_btn)
         
         self.pdf_summarize_btn = QPushButton(" Резюмировать")
         self.pdf_summarize_btn.setMinimumHeight(45)
-        self.pdf_summarize_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        self.pdf_summarize_btn.setFont(_FONT_BUTTON)
+        self.pdf_summarize_btn.clicked.connect(self.on_pdf_summarize_clicked)
         buttons_layout.addWidget(self.pdf_summarize_btn)
         layout.addLayout(buttons_layout)
         
         # Query input for analysis
         query_label = QLabel(" Вопрос (для анализа):")
-        query_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        query_label.setFont(_FONT_LABEL)
         layout.addWidget(query_label)
         
         self.pdf_query_input = QLineEdit()
@@ -872,14 +1568,15 @@ class AIWebsiteReaderApp(QMainWindow):
         
         self.pdf_analyze_btn = QPushButton(" Анализировать")
         self.pdf_analyze_btn.setMinimumHeight(45)
-        self.pdf_analyze_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        self.pdf_analyze_btn.setFont(_FONT_BUTTON)
+        self.pdf_analyze_btn.clicked.connect(self.on_pdf_analyze_clicked)
         layout.addWidget(self.pdf_analyze_btn)
         
         layout.addSpacing(10)
         
         # Metrics
         self.pdf_metrics = QLabel("Результаты появятся здесь...")
-        self.pdf_metrics.setFont(QFont("Segoe UI", 9))
+        self.pdf_metrics.setFont(_FONT_SMALL)
         self.pdf_metrics.setStyleSheet("color: #666;")
         layout.addWidget(self.pdf_metrics)
         
@@ -891,7 +1588,7 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Status
         self.pdf_status = QLabel("✅ Готово")
-        self.pdf_status.setFont(QFont("Segoe UI", 9))
+        self.pdf_status.setFont(_FONT_SMALL)
         self.pdf_status.setStyleSheet("color: #28a745;")
         layout.addWidget(self.pdf_status)
         
@@ -906,14 +1603,16 @@ class AIWebsiteReaderApp(QMainWindow):
         
         # Title
         title = QLabel(" Справка и инструкции")
-        title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
-        title.setFont(title_font)
+        title.setFont(_FONT_TITLE)
         title.setStyleSheet("color: #667eea;")
         layout.addWidget(title)
         
         # Help text
-        help_text = QTextEdit()
-        help_text.setReadOnly(True)
+        help_text = QLabel()
+        help_text.setTextFormat(Qt.TextFormat.PlainText)
+        help_text.setWordWrap(True)
+        help_text.setAlignment(Qt.AlignmentFlag.AlignTop)
+        help_text.setStyleSheet("background-color: white; padding: 10px;")
         help_content = """
 КАК ИСПОЛЬЗОВАТЬ AI WEBSITE READER?
 
@@ -940,47 +1639,40 @@ class AIWebsiteReaderApp(QMainWindow):
 
         """
         help_text.setText(help_content)
-        layout.addWidget(help_text)
+        
+        # Static text needs no editor; a label in a scroll area is far lighter
+        scroll = QScrollArea()
+        scroll.setWidget(help_text)
+        scroll.setWidgetResizable(True)
+        layout.addWidget(scroll)
         
         return widget
     
-    def setup_connections(self):
-        """Setup signal connections"""
-        self.summarize_btn.clicked.connect(self.on_summarize_clicked)
-        self.analyze_btn.clicked.connect(self.on_analyze_clicked)
-        self.extract_btn.clicked.connect(self.on_extract_clicked)
-        self.download_btn.clicked.connect(self.on_download_clicked)
-        self.clear_history_btn.clicked.connect(self.on_clear_history_clicked)
-        self.pdf_browse_btn.clicked.connect(self.on_pdf_browse_clicked)
-        self.pdf_extract_btn.clicked.connect(self.on_pdf_extract_clicked)
-        self.pdf_summarize_btn.clicked.connect(self.on_pdf_summarize_clicked)
-        self.pdf_analyze_btn.clicked.connect(self.on_pdf_analyze_clicked)
-    
     def on_api_key_changed(self):
         """Update API key"""
-        self.api_key = self.api_input.text()
+        api_key = self.api_input.text().strip()
+        if len(api_key) < _MIN_API_KEY_LENGTH:
+            # Too short to be a real key; treat a half-typed value as no key at all
+            api_key = ""
+        # One client per key: its connection pool is shared by every job
+        if self.client is not None and api_key == self.api_key:
+            return
+        self.api_key = api_key
+        if self.client is not None:
+            self.retire_client(self.client)
+            self.client = None
         if self.api_key:
             try:
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = _make_openai_client(self.api_key)
             except Exception as e:
                 self.show_error("Ошибка API", str(e))
     
-    def extract_text(self, html_content):
-        """Extract text from HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
-    
-    def get_title(self, html_content):
-        """Extract title from HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        title = soup.find('title')
-        return title.string if title else "Неизвестный сайт"
+    def retire_client(self, client):
+        """Close a replaced client once no queued or running task still uses it"""
+        if any(worker.client is client for worker in self.active_workers):
+            self.retired_clients.append(client)
+        else:
+            client.close()
     
     def on_summarize_clicked(self):
         """Handle summarize button click"""
@@ -988,29 +1680,41 @@ class AIWebsiteReaderApp(QMainWindow):
             self.show_error("Ошибка", "Введите OpenAI API Key")
             return
         
-        url = self.url_input_summarize.text().strip()
-        if not url:
+        urls = self.url_input_summarize.text().split()
+        if not urls:
             self.show_error("Ошибка", "Введите URL сайта")
             return
         
-        if not url.startswith('http'):
-            url = 'https://' + url
+        urls = [url if url.startswith('http') else 'https://' + url for url in urls]
         
         self.summarize_status.setText("⏳ Загружаю сайт...")
         self.summarize_status.setStyleSheet("color: #ffc107;")
         self.summarize_btn.setEnabled(False)
         
-        self.current_url = url
-        
-        # Clean up old thread if exists
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
+        if len(urls) > 1:
+            self.start_batch_summarize(urls)
+            return
         
-        self.worker_thread = WorkerThread("fetch", url, client=self.client)
-        self.worker_thread.finished.connect(lambda html: self.on_website_fetched(html, "summarize"))
-        self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "summarize"))
-        self.worker_thread.start()
+        # Map-reduced summaries read well past the single-prompt budget
+        max_chars = _SUMMARY_SOURCE_CHARS if self.map_reduce_checkbox.isChecked() else _PROMPT_CHARS
+        self.fetch_page_text(urls[0], "summarize", max_chars)
+    
+    def start_batch_summarize(self, urls):
+        """Summarize several pages in one pooled job"""
+        self.summarize_status.setText(f"⏳ Загружаю и резюмирую страницы: {len(urls)}")
+        worker = WorkerRunnable(
+            "batch_summarize",
+            tuple(urls),
+            client=self.client,
+            model=self.model_combo.currentText(),
+            max_length=self.length_slider.value(),
+            cache=self.query_cache
+        )
+        self.summarize_result.clear()
+        worker.signals.progress.connect(lambda delta: self.append_stream_text(self.summarize_result, delta))
+        worker.signals.finished.connect(self.on_batch_summarize_complete)
+        worker.signals.error.connect(lambda err: self.on_worker_error(err, "summarize"))
+        self.start_worker(worker, "summarize")
     
     def on_analyze_clicked(self):
         """Handle analyze button click"""
@@ -1020,6 +1724,9 @@ class AIWebsiteReaderApp(QMainWindow):
         
         url = self.url_input_analyze.text().strip()
         query = self.question_input.toPlainText().strip()
+        if query and self.batch_questions_checkbox.isChecked():
+            # All questions ride on one request so the page is sent and billed once
+            query = tuple(line.strip() for line in query.splitlines() if line.strip())
         
         if not url or not query:
             self.show_error("Ошибка", "Введите URL и вопрос")
@@ -1032,17 +1739,7 @@ class AIWebsiteReaderApp(QMainWindow):
         self.analyze_status.setStyleSheet("color: #ffc107;")
         self.analyze_btn.setEnabled(False)
         
-        self.current_url = url
-        
-        # Clean up old thread if exists
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
-        
-        self.worker_thread = WorkerThread("fetch", url, query=query, client=self.client)
-        self.worker_thread.finished.connect(lambda html: self.on_website_fetched(html, "analyze"))
-        self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "analyze"))
-        self.worker_thread.start()
+        self.fetch_page_text(url, "analyze", _PROMPT_CHARS, query)
     
     def on_extract_clicked(self):
         """Handle extract button click"""
@@ -1058,108 +1755,219 @@ class AIWebsiteReaderApp(QMainWindow):
         self.extract_status.setStyleSheet("color: #ffc107;")
         self.extract_btn.setEnabled(False)
         
-        self.current_url = url
+        page = self.cached_page(url, None)
+        if page is not None:
+            self.set_current_page(url, *page)
+            self.process_page("extract", url, *page)
+            return
         
-        # Clean up old thread if exists
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
+        worker = WorkerRunnable("fetch", url, client=self.client)
+        worker.signals.finished.connect(lambda page: self.on_website_fetched(page, url))
+        worker.signals.error.connect(lambda err: self.on_worker_error(err, "extract"))
+        self.start_worker(worker, "extract")
+    
+    def cached_entry(self, url):
+        """Return the cache entry for url, dropping it once it has expired"""
+        entry = self.page_cache.get(url)
+        if entry is not None and time.monotonic() - entry[3] > _PAGE_CACHE_TTL:
+            del self.page_cache[url]
+            return None
+        return entry
+    
+    def cached_page(self, url, max_chars):
+        """Return a cached (title, text) holding at least max_chars of the page"""
+        entry = self.cached_entry(url)
+        if entry is None:
+            return None
+        read = entry[2]
+        if read is not None and (max_chars is None or read < max_chars):
+            return None
+        self.page_cache.move_to_end(url)
+        return entry[0], entry[1]
+    
+    def cache_page(self, url, page, max_chars):
+        """Remember page text, never replacing a longer fresh read of the same URL"""
+        entry = self.cached_entry(url)
+        if entry is not None and (entry[2] is None or (max_chars is not None and entry[2] >= max_chars)):
+            return
+        self.page_cache[url] = (*page, max_chars, time.monotonic())
+        self.page_cache.move_to_end(url)
+        while len(self.page_cache) > _PAGE_CACHE_SIZE:
+            self.page_cache.popitem(last=False)
+    
+    def fetch_page_text(self, url, task_type, max_chars, query=None):
+        """Get page text for an AI task from the cache or a streamed fetch"""
+        page = self.cached_page(url, max_chars)
+        if page is not None:
+            self.on_page_text_fetched(page, task_type, url, query)
+            return
         
-        self.worker_thread = WorkerThread("fetch", url, client=self.client)
-        self.worker_thread.finished.connect(lambda html: self.on_website_fetched(html, "extract"))
-        self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "extract"))
-        self.worker_thread.start()
+        worker = WorkerRunnable("fetch_text", url, query=query, client=self.client, max_chars=max_chars)
+        worker.signals.finished.connect(lambda page: self.cache_page(url, page, max_chars))
+        worker.signals.finished.connect(lambda page: self.on_page_text_fetched(page, task_type, url, query))
+        worker.signals.error.connect(lambda err: self.on_worker_error(err, task_type))
+        self.start_worker(worker, task_type)
     
-    def on_website_fetched(self, html, task_type):
-        """Handle website fetch completion"""
+    def set_current_page(self, url, title, text):
+        """Remember the extracted page the download button saves"""
+        if text is not self.current_text:
+            # Character and word counts are taken once per text, not on every display
+            self.current_stats = (len(text), len(text.split()))
+        self.current_url, self.current_title, self.current_text = url, title, text
+    
+    def on_website_fetched(self, page, url):
+        """Handle a fetched and parsed page for text extraction"""
         try:
-            self.current_text = self.extract_text(html)
-            self.current_title = self.get_title(html)
-            
-            if task_type == "summarize":
-                self.summarize_status.setText("⏳ ИИ анализирует содержимое...")
-                self.summarize_status.setStyleSheet("color: #ffc107;")
-                
-                # Clean up old thread
-                if self.worker_thread:
-                    self.worker_thread.quit()
-                    self.worker_thread.wait()
-                
-                self.worker_thread = WorkerThread(
-                    "summarize", 
-                    self.current_url, 
-                    content=self.current_text,
-                    client=self.client,
-                    model=self.model_combo.currentText(),
-                    max_length=self.length_slider.value()
-                )
-                self.worker_thread.finished.connect(lambda result: self.on_summarize_complete(result))
-                self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "summarize"))
-                self.worker_thread.start()
+            title, text = page
+            self.cache_page(url, (title, text), None)
+            self.set_current_page(url, title, text)
+            self.process_page("extract", url, title, text)
+        except Exception as e:
+            self.show_error("Ошибка обработки", str(e))
+    
+    def on_page_text_fetched(self, page, task_type, url, query=None):
+        """Handle streamed page text for the AI tasks"""
+        title, text = page
+        try:
+            self.process_page(task_type, url, title, text, query)
+        except Exception as e:
+            self.show_error("Ошибка обработки", str(e))
+    
+    def process_page(self, task_type, url, title, text, query=None):
+        """Continue a task once the page text is available
+        
+        The page is passed along rather than kept on the window, so tasks that
+        overlap in the thread pool never report another task's page.
+        """
+        if task_type == "summarize":
+            self.summarize_status.setText("⏳ ИИ анализирует содержимое...")
+            self.summarize_status.setStyleSheet("color: #ffc107;")
             
-            elif task_type == "analyze":
-                self.analyze_status.setText("⏳ ИИ отвечает на вопрос...")
-                self.analyze_status.setStyleSheet("color: #ffc107;")
-                
-                # Clean up old thread
-                if self.worker_thread:
-                    self.worker_thread.quit()
-                    self.worker_thread.wait()
-                
-                self.worker_thread = WorkerThread(
-                    "analyze",
-                    self.current_url,
-                    query=self.question_input.toPlainText(),
-                    content=self.current_text,
-                    client=self.client,
-                    model=self.model_combo.currentText()
-                )
-                self.worker_thread.finished.connect(lambda result: self.on_analyze_complete(result))
-                self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "analyze"))
-                self.worker_thread.start()
+            # Voice the summary right away so audio is ready while the user reads
+            self.ensure_tab(_TAB_TTS)
+            voiced = self.tts_checkbox.isChecked() and self.tts_btn.isEnabled()
+            worker = WorkerRunnable(
+                "summarize", 
+                url, 
+                content=text,
+                client=self.client,
+                model=self.model_combo.currentText(),
+                max_length=self.length_slider.value(),
+                voice=self.selected_voice if voiced else None,
+                audio_path=self.audio_tmp_path,
+                map_reduce=self.map_reduce_checkbox.isChecked(),
+                cache=self.query_cache
+            )
+            self.summarize_result.clear()
+            worker.signals.progress.connect(lambda delta: self.append_stream_text(self.summarize_result, delta))
+            worker.signals.finished.connect(lambda result: self.on_summarize_complete(result, url, title, len(text), worker.trimmed_to, voiced))
+            worker.signals.error.connect(lambda err: self.on_worker_error(err, "summarize"))
+            if voiced:
+                self.prepare_tts()
+                worker.signals.audio_ready.connect(self.on_tts_complete)
+                worker.signals.audio_error.connect(self.on_tts_error)
+                worker.signals.done.connect(self.end_summary_speech)
+            self.start_worker(worker, "summarize")
+        
+        elif task_type == "analyze":
+            self.analyze_status.setText("⏳ ИИ отвечает на вопрос...")
+            self.analyze_status.setStyleSheet("color: #ffc107;")
             
-            elif task_type == "extract":
-                self.extract_result.setText(self.current_text)
-                self.extract_chars.setText(f" Символов: {len(self.current_text)}")
-                self.extract_words.setText(f" Слов: {len(self.current_text.split())}")
-                self.extract_status.setText("✅ Текст извлечен")
-                self.extract_status.setStyleSheet("color: #28a745;")
-                self.extract_btn.setEnabled(True)
+            worker = WorkerRunnable(
+                "analyze",
+                url,
+                query=query,
+                content=text,
+                client=self.client,
+                model=self.model_combo.currentText(),
+                cache=self.query_cache
+            )
+            self.analyze_result.clear()
+            worker.signals.progress.connect(lambda delta: self.append_stream_text(self.analyze_result, delta))
+            worker.signals.finished.connect(lambda result: self.on_analyze_complete(result, url, title, query, worker.trimmed_to))
+            worker.signals.error.connect(lambda err: self.on_worker_error(err, "analyze"))
+            self.start_worker(worker, "analyze")
         
-        except Exception as e:
-            self.show_error("Ошибка обработки", str(e))
+        elif task_type == "extract":
+            chars, words = self.current_stats
+            self.extract_result.setText(text)
+            self.extract_chars.setText(f" Символов: {chars}")
+            self.extract_words.setText(f" Слов: {words}")
+            self.extract_status.setText("✅ Текст извлечен")
+            self.extract_status.setStyleSheet("color: #28a745;")
+            self.extract_btn.setEnabled(True)
     
-    def on_summarize_complete(self, result):
+    def append_stream_text(self, text_edit, delta):
+        """Append a streamed chunk of model output to a result view"""
+        text_edit.moveCursor(QTextCursor.MoveOperation.End)
+        text_edit.insertPlainText(delta)
+    
+    def on_summarize_complete(self, result, url, title, text_length, trimmed_to, voiced=False):
         """Handle summarize completion"""
-        self.summarize_result.setText(result)
-        self.summarize_metrics.setText(f" {self.current_title} |  {len(self.current_text)} символов")
-        self.summarize_status.setText("✅ Резюме готово")
+        # The text is already in the view, appended chunk by chunk as it streamed
+        self.summarize_metrics.setText(f" {title} |  {text_length} символов")
+        self.summarize_status.setText(self.done_status("✅ Резюме готово", trimmed_to))
         self.summarize_status.setStyleSheet("color: #28a745;")
         self.summarize_btn.setEnabled(True)
         
-        self.history.append({
-            "type": "Резюме",
-            "title": self.current_title,
-            "result": result,
-            "time": datetime.now()
-        })
-        self.update_history_list()
+        # A summary that could not be voiced while streaming is voiced now
+        self.ensure_tab(_TAB_TTS)
+        if voiced:
+            self.tts_text_input.setPlainText(result)
+        elif self.tts_checkbox.isChecked() and result and self.tts_btn.isEnabled():
+            self.tts_text_input.setPlainText(result)
+            self.start_tts(result)
+        
+        self.add_history_entry("Резюме", url, title, None, result)
+    
+    def on_batch_summarize_complete(self, results):
+        """Handle completion of a multi-URL summarize job"""
+        self.summarize_metrics.setText(f" Страниц: {len(results)}")
+        self.summarize_status.setText("✅ Резюме готовы")
+        self.summarize_status.setStyleSheet("color: #28a745;")
+        self.summarize_btn.setEnabled(True)
+        for url, title, summary in results:
+            self.add_history_entry("Резюме", url, title, None, summary)
     
-    def on_analyze_complete(self, result):
+    def on_analyze_complete(self, result, url, title, query, trimmed_to):
         """Handle analyze completion"""
-        self.analyze_result.setText(result)
-        self.analyze_status.setText("✅ Анализ завершен")
+        self.analyze_status.setText(self.done_status("✅ Анализ завершен", trimmed_to))
         self.analyze_status.setStyleSheet("color: #28a745;")
         self.analyze_btn.setEnabled(True)
         
-        self.history.append({
-            "type": "Анализ",
-            "title": self.current_title,
-            "query": self.question_input.toPlainText(),
-            "result": result,
-            "time": datetime.now()
-        })
-        self.update_history_list()
+        if isinstance(query, tuple):
+            query = "\n".join(query)
+        self.add_history_entry("Анализ", url, title, query, result)
+    
+    def done_status(self, status, trimmed_to):
+        """Completion status, noting when the input was cut to fit the model"""
+        if trimmed_to is None:
+            return status
+        return f"{status} · текст сокращён до {trimmed_to} токенов"
+    
+    def start_worker(self, worker, task_key):
+        """Queue a runnable, cancelling the previous one started under task_key"""
+        previous = self.running_tasks.get(task_key)
+        if previous is not None:
+            previous.cancel()
+        self.running_tasks[task_key] = worker
+        
+        # The pool only holds the C++ side; without this the Python wrapper and
+        # its signals can be collected before the queued result is delivered
+        self.active_workers.add(worker)
+        worker.signals.done.connect(lambda: self.release_worker(worker, task_key))
+        self.thread_pool.start(worker)
+    
+    def release_worker(self, worker, task_key):
+        """Forget a runnable once its last signal has been delivered"""
+        self.active_workers.discard(worker)
+        if self.running_tasks.get(task_key) is worker:
+            del self.running_tasks[task_key]
+        if self.retired_clients:
+            in_use = {w.client for w in self.active_workers}
+            for client in [c for c in self.retired_clients if c not in in_use]:
+                self.retired_clients.remove(client)
+                client.close()
     
     def on_worker_error(self, error, task_type):
         """Handle worker error"""
@@ -1178,13 +1986,32 @@ class AIWebsiteReaderApp(QMainWindow):
             self.extract_status.setStyleSheet("color: #dc3545;")
             self.extract_btn.setEnabled(True)
     
-    def update_history_list(self):
-        """Update history list widget"""
-        self.history_list.clear()
-        for i, item in enumerate(reversed(self.history), 1):
-            time_str = item["time"].strftime("%H:%M:%S")
-            text = f"#{i} {item['type']} - {item['title']} ({time_str})"
-            self.history_list.addItem(text)
+    def add_history_entry(self, kind, url, title, query, result):
+        """Store a finished task and show it at the top of the history list"""
+        row = self.history.add(kind, url, title, query, result)
+        if self._tab_builders[_TAB_HISTORY] is not None:
+            # Not built yet; the tab fills itself from self.history when first shown
+            return
+        # Entries are numbered by insertion, so existing rows never need relabelling
+        self.history_list.insertItem(0, self.history_label(*row))
+        # The store keeps only the newest _HISTORY_LIMIT rows; drop what it pruned
+        while self.history_list.count() > _HISTORY_LIMIT:
+            self.history_list.takeItem(self.history_list.count() - 1)
+    
+    def history_label(self, number, kind, title, ts):
+        """Format one history row for the list"""
+        time_str = datetime.fromtimestamp(ts).strftime("%d.%m %H:%M:%S")
+        return f"#{number} {kind} - {title} ({time_str})"
+    
+    def load_more_history(self):
+        """Append the next page of stored history to the list"""
+        rows = self.history.page(self.history_list.count(), _HISTORY_PAGE)
+        self.history_list.addItems([self.history_label(*row) for row in rows])
+    
+    def on_history_scrolled(self, value):
+        """Load more history when the list is scrolled to its end"""
+        if value >= self.history_list.verticalScrollBar().maximum():
+            self.load_more_history()
     
     def on_download_clicked(self):
         """Handle download button click"""
@@ -1201,8 +2028,13 @@ class AIWebsiteReaderApp(QMainWindow):
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.current_text)
+                # Written to a temp file and renamed on commit, so a failed save never truncates the target
+                f = QSaveFile(filename)
+                if not f.open(QIODevice.OpenModeFlag.WriteOnly):
+                    raise OSError(f.errorString())
+                f.write(self.current_text.encode('utf-8'))
+                if not f.commit():
+                    raise OSError(f.errorString())
                 self.show_info("Успех", f"Файл сохранен:\n{filename}")
             except Exception as e:
                 self.show_error("Ошибка сохранения", str(e))
@@ -1239,38 +2071,41 @@ class AIWebsiteReaderApp(QMainWindow):
 
     def closeEvent(self, event):
         """Clean up threads on exit"""
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
+        self.thread_pool.clear()
+        # Let in-flight downloads and streams stop at their next chunk
+        for worker in self.active_workers:
+            worker.cancel()
+        self.thread_pool.waitForDone()
+        self.release_audio()
+        if os.path.exists(self.audio_tmp_path):
+            os.remove(self.audio_tmp_path)
         event.accept()
 
 
-    def select_voice(self, voice_id):
+    def select_voice(self, voice_index):
         """Select a voice for TTS"""
-        self.selected_voice = voice_id
-        # Update button states
-        for v_id, btn in self.voice_buttons.items():
-            btn.setChecked(v_id == voice_id)
+        self.selected_voice = _VOICE_IDS[voice_index]
     
     
     def load_summary_to_tts(self):
         """Load summary text to TTS"""
-        text = self.summarize_result.toPlainText()
-        if not text:
+        self.ensure_tab(_TAB_SUMMARIZE)
+        if self.summarize_result.document().isEmpty():
             self.show_error("Ошибка", "Сначала создайте резюме сайта")
             return
-        self.tts_text_input.setText(text)
+        self.tts_text_input.setPlainText(self.summarize_result.toPlainText())
         self.tts_status.setText(" Текст загружен из резюме")
         self.tts_status.setStyleSheet("color: #667eea;")
     
     
     def load_extract_to_tts(self):
         """Load extracted text to TTS"""
-        text = self.extract_result.toPlainText()
-        if not text:
+        self.ensure_tab(_TAB_EXTRACT)
+        if self.extract_result.document().isEmpty():
             self.show_error("Ошибка", "Сначала извлеките текст из сайта")
             return
-        self.tts_text_input.setText(text)
+        # The view shows current_text verbatim, so reuse it instead of copying the document out
+        self.tts_text_input.setPlainText(self.current_text)
         self.tts_status.setText(" Текст загружен из извлечения")
         self.tts_status.setStyleSheet("color: #667eea;")
     
@@ -1286,22 +2121,37 @@ class AIWebsiteReaderApp(QMainWindow):
             self.show_error("Ошибка", "Введите текст для озвучивания")
             return
         
+        self.start_tts(text)
+    
+    def prepare_tts(self):
+        """Free the audio file and lock the TTS controls for a new take"""
+        self.release_audio()
         self.tts_status.setText(" Генерирую аудио...")
         self.tts_status.setStyleSheet("color: #ffc107;")
         self.tts_btn.setEnabled(False)
+    
+    def end_summary_speech(self):
+        """Unlock the TTS controls after a voiced summary that produced no audio"""
+        if not self.tts_btn.isEnabled():
+            self.tts_status.setText("✅ Готово")
+            self.tts_status.setStyleSheet("color: #28a745;")
+            self.tts_btn.setEnabled(True)
+    
+    def start_tts(self, text):
+        """Dispatch a TTS job for the given text"""
+        self.prepare_tts()
         
-        # Create worker thread for TTS
-        worker = WorkerThread(
+        # Create pooled worker for TTS
+        worker = WorkerRunnable(
             "tts",
-            "",
+            self.audio_tmp_path,
             content=text,
             client=self.client,
             model=self.selected_voice
         )
-        self.worker_thread = worker
-        worker.finished.connect(self.on_tts_complete)
-        worker.error.connect(lambda err: self.on_tts_error(err))
-        worker.start()
+        worker.signals.finished.connect(self.on_tts_complete)
+        worker.signals.error.connect(lambda err: self.on_tts_error(err))
+        self.start_worker(worker, "tts")
     
     
     def on_tts_complete(self, audio_path):
@@ -1330,18 +2180,32 @@ class AIWebsiteReaderApp(QMainWindow):
             return
         
         try:
-            import platform
-            if platform.system() == 'Windows':
-                os.startfile(self.audio_file_path)
-            elif platform.system() == 'Darwin':  # macOS
-                os.system(f'open "{self.audio_file_path}"')
-            else:  # Linux
-                os.system(f'xdg-open "{self.audio_file_path}"')
+            if QMediaPlayer is not None:
+                # Played in-process; the player is created on first use and reused
+                if self.player is None:
+                    self.player = QMediaPlayer(self)
+                    self.player.setAudioOutput(QAudioOutput(self.player))
+                self.player.setSource(QUrl.fromLocalFile(self.audio_file_path))
+                self.player.play()
+            else:
+                import platform
+                if platform.system() == 'Windows':
+                    os.startfile(self.audio_file_path)
+                elif platform.system() == 'Darwin':  # macOS
+                    os.system(f'open "{self.audio_file_path}"')
+                else:  # Linux
+                    os.system(f'xdg-open "{self.audio_file_path}"')
             self.audio_output.setText(f"🔊 Воспроизведение: {os.path.basename(self.audio_file_path)}")
         except Exception as e:
             self.show_error("Ошибка воспроизведения", str(e))
     
     
+    def release_audio(self):
+        """Stop playback and let go of the audio file so it can be rewritten or moved"""
+        if self.player is not None:
+            self.player.stop()
+            self.player.setSource(QUrl())
+    
     def download_audio(self):
         """Download generated audio"""
         if not self.audio_file_path or not os.path.exists(self.audio_file_path):
@@ -1356,9 +2220,25 @@ class AIWebsiteReaderApp(QMainWindow):
         )
         
         if filename:
+            self.release_audio()
             try:
-                import shutil
-                shutil.copy(self.audio_file_path, filename)
+                moved = False
+                if os.path.abspath(filename) == os.path.abspath(self.audio_file_path):
+                    # Already saved there; copying onto itself would truncate it
+                    moved = True
+                elif self.audio_file_path == self.audio_tmp_path:
+                    try:
+                        # A rename moves no data; the saved file becomes the one to play
+                        os.replace(self.audio_file_path, filename)
+                        self.audio_file_path = filename
+                        moved = True
+                    except OSError:
+                        pass
+                if not moved:
+                    # An earlier saved copy stays where the user put it; a scratch file
+                    # on another drive is streamed across in large blocks
+                    with open(self.audio_file_path, "rb") as src, open(filename, "wb") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
                 self.show_info("Успех", f"Аудио сохранено:\n{filename}")
             except Exception as e:
                 self.show_error("Ошибка сохранения", str(e))
@@ -1391,15 +2271,10 @@ class AIWebsiteReaderApp(QMainWindow):
         self.pdf_summarize_btn.setEnabled(False)
         self.pdf_analyze_btn.setEnabled(False)
         
-        # Clean up old thread if exists
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
-        
-        self.worker_thread = WorkerThread("extract_pdf", file_path, client=self.client)
-        self.worker_thread.finished.connect(self.on_pdf_text_extracted)
-        self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "pdf"))
-        self.worker_thread.start()
+        worker = WorkerRunnable("extract_pdf", file_path, client=self.client)
+        worker.signals.finished.connect(self.on_pdf_text_extracted)
+        worker.signals.error.connect(lambda err: self.on_worker_error(err, "pdf"))
+        self.start_worker(worker, "pdf")
     
     def on_pdf_summarize_clicked(self):
         """Handle PDF summarize button click"""
@@ -1407,7 +2282,7 @@ class AIWebsiteReaderApp(QMainWindow):
             self.show_error("Ошибка", "Введите OpenAI API Key")
             return
         
-        if not self.current_text:
+        if not self.pdf_text:
             self.show_error("Ошибка", "Сначала извлеките текст из PDF")
             return
         
@@ -1417,16 +2292,14 @@ class AIWebsiteReaderApp(QMainWindow):
         self.pdf_summarize_btn.setEnabled(False)
         self.pdf_analyze_btn.setEnabled(False)
         
-        # Clean up old thread if exists
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
-        
         max_length = self.length_slider.value()
-        self.worker_thread = WorkerThread("summarize", "", content=self.current_text, client=self.client, max_length=max_length)
-        self.worker_thread.finished.connect(lambda result: self.on_pdf_summarized(result))
-        self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "pdf"))
-        self.worker_thread.start()
+        worker = WorkerRunnable("summarize", "", content=self.pdf_text, client=self.client, max_length=max_length,
+                                cache=self.query_cache)
+        self.pdf_result.clear()
+        worker.signals.progress.connect(lambda delta: self.append_stream_text(self.pdf_result, delta))
+        worker.signals.finished.connect(lambda result: self.on_pdf_summarized(result, worker.trimmed_to))
+        worker.signals.error.connect(lambda err: self.on_worker_error(err, "pdf"))
+        self.start_worker(worker, "pdf")
     
     def on_pdf_analyze_clicked(self):
         """Handle PDF analyze button click"""
@@ -1434,7 +2307,7 @@ class AIWebsiteReaderApp(QMainWindow):
             self.show_error("Ошибка", "Введите OpenAI API Key")
             return
         
-        if not self.current_text:
+        if not self.pdf_text:
             self.show_error("Ошибка", "Сначала извлеките текст из PDF")
             return
         
@@ -1449,19 +2322,17 @@ class AIWebsiteReaderApp(QMainWindow):
         self.pdf_summarize_btn.setEnabled(False)
         self.pdf_analyze_btn.setEnabled(False)
         
-        # Clean up old thread if exists
-        if self.worker_thread:
-            self.worker_thread.quit()
-            self.worker_thread.wait()
-        
-        self.worker_thread = WorkerThread("analyze", "", query=query, content=self.current_text, client=self.client)
-        self.worker_thread.finished.connect(lambda result: self.on_pdf_analyzed(result))
-        self.worker_thread.error.connect(lambda err: self.on_worker_error(err, "pdf"))
-        self.worker_thread.start()
+        worker = WorkerRunnable("analyze", "", query=query, content=self.pdf_text, client=self.client,
+                                cache=self.query_cache)
+        self.pdf_result.clear()
+        worker.signals.progress.connect(lambda delta: self.append_stream_text(self.pdf_result, delta))
+        worker.signals.finished.connect(lambda result: self.on_pdf_analyzed(result, worker.trimmed_to))
+        worker.signals.error.connect(lambda err: self.on_worker_error(err, "pdf"))
+        self.start_worker(worker, "pdf")
     
     def on_pdf_text_extracted(self, text):
         """Handle PDF text extraction completion"""
-        self.current_text = text
+        self.pdf_text = text
         self.pdf_result.setPlainText(text)
         self.pdf_metrics.setText(f" Длина текста: {len(text)} символов")
         self.pdf_status.setText("✅ Текст извлечен")
@@ -1470,19 +2341,17 @@ class AIWebsiteReaderApp(QMainWindow):
         self.pdf_summarize_btn.setEnabled(True)
         self.pdf_analyze_btn.setEnabled(True)
     
-    def on_pdf_summarized(self, summary):
+    def on_pdf_summarized(self, summary, trimmed_to):
         """Handle PDF summarization completion"""
-        self.pdf_result.setPlainText(summary)
-        self.pdf_status.setText("✅ Резюме готово")
+        self.pdf_status.setText(self.done_status("✅ Резюме готово", trimmed_to))
         self.pdf_status.setStyleSheet("color: #28a745;")
         self.pdf_extract_btn.setEnabled(True)
         self.pdf_summarize_btn.setEnabled(True)
         self.pdf_analyze_btn.setEnabled(True)
     
-    def on_pdf_analyzed(self, answer):
+    def on_pdf_analyzed(self, answer, trimmed_to):
         """Handle PDF analysis completion"""
-        self.pdf_result.setPlainText(answer)
-        self.pdf_status.setText("✅ Анализ завершен")
+        self.pdf_status.setText(self.done_status("✅ Анализ завершен", trimmed_to))
         self.pdf_status.setStyleSheet("color: #28a745;")
         self.pdf_extract_btn.setEnabled(True)
         self.pdf_summarize_btn.setEnabled(True)
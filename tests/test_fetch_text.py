@@ -0,0 +1,60 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+def serve(body):
+    """Start a local server answering every GET with body; return its URL and server"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/", server
+
+
+@pytest.fixture
+def page():
+    servers = []
+
+    def start(body):
+        url, server = serve(body)
+        servers.append(server)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_fetch_text_skips_text_inside_noise_tags(page):
+    url = page(
+        "<html><head><title>Тест</title></head><body>"
+        "<noscript><p>nojs</p></noscript><p>Видимый текст</p>"
+        "</body></html>".encode("utf-8")
+    )
+    title, text = app.WorkerRunnable("fetch_text", url)._fetch_text()
+    assert title == "Тест"
+    assert text == "Видимый текст"
+
+
+@pytest.mark.parametrize("body", [b"", b"  \n\t "])
+def test_fetch_text_returns_empty_page_for_blank_body(page, body):
+    url = page(body)
+    assert app.WorkerRunnable("fetch_text", url)._fetch_text() == ("Неизвестный сайт", "")